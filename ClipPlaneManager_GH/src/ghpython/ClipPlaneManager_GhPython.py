@@ -80,26 +80,51 @@ def all_viewport_ids(doc):
                 pass
     if len(ids) == 0 and doc.Views.ActiveView:
         ids.append(doc.Views.ActiveView.ActiveViewportID)
-    # distinct
+    # distinct (keyed on the string form so membership never calls Guid.Equals)
+    seen = set()
     uniq = []
+    append = uniq.append
     for i in ids:
-        if i not in uniq:
-            uniq.append(i)
+        k = i.ToString()
+        if k not in seen:
+            seen.add(k)
+            append(i)
     return uniq
 
+def _get_vps_cached(doc):
+    # Viewport ids only change when views are opened/closed or switched, so
+    # reuse the last list while (doc, view count, active viewport) is unchanged.
+    active = doc.Views.ActiveView
+    fp = (doc.RuntimeSerialNumber, doc.Views.Count,
+          str(active.ActiveViewportID) if active else "")
+    cached = sc.sticky.get("_clip_vps_cache")
+    if cached and cached[0] == fp:
+        return cached[1]
+    ids = all_viewport_ids(doc)
+    sc.sticky["_clip_vps_cache"] = (fp, ids)
+    return ids
+
 def get_clips_in_layer(doc, layer_name):
     ros = doc.Objects.FindByLayer(layer_name)
     if not ros: return []
     return [o for o in ros if isinstance(o, Rhino.DocObjects.ClippingPlaneObject)]
 
+def same_plane(a, b, eps=1e-9):
+    # Component-wise compare of origin and X/Y axes (Z follows from X and Y)
+    for u, v in ((a.Origin, b.Origin), (a.XAxis, b.XAxis), (a.YAxis, b.YAxis)):
+        if abs(u.X - v.X) > eps or abs(u.Y - v.Y) > eps or abs(u.Z - v.Z) > eps:
+            return False
+    return True
+
 def create_clip(doc, plane, size, layer_index, vps):
+    """Returns (id, object) of the new clipping plane, or (Guid.Empty, None)."""
     if size is None or size <= 0.0: size = 1000.0
     cid = doc.Objects.AddClippingPlane(plane, size, size, vps)
-    if cid == System.Guid.Empty: return System.Guid.Empty
+    if cid == System.Guid.Empty: return System.Guid.Empty, None
     attr = Rhino.DocObjects.ObjectAttributes()
     attr.LayerIndex = layer_index
     doc.Objects.ModifyAttributes(cid, attr, True)
-    return cid
+    return cid, doc.Objects.FindId(cid)
 
 def main(P, Create, Size):
     ClipId = System.Guid.Empty
@@ -113,22 +138,35 @@ def main(P, Create, Size):
     sc.doc = doc
     try:
         layer_index = ensure_layer(doc, "Clipping Plane")
-        vps = all_viewport_ids(doc)
+        vps = _get_vps_cached(doc)
 
         clips = get_clips_in_layer(doc, "Clipping Plane")
+        touched = False  # doc changed this run, so a redraw is owed
 
         if len(clips) == 0 and Create:
-            nid = create_clip(doc, Rhino.Geometry.Plane.WorldXY, Size, layer_index, vps)
-            if nid == System.Guid.Empty:
+            nid, nobj = create_clip(doc, Rhino.Geometry.Plane.WorldXY, Size, layer_index, vps)
+            if nid == System.Guid.Empty or nobj is None:
                 return ClipId, "Failed to create clipping plane."
-            clips = get_clips_in_layer(doc, "Clipping Plane")
+            clips = [nobj]
+            touched = True
 
         # Keep exactly one
         if len(clips) > 1:
-            clips.sort(key=lambda c: str(c.Id))  # stable heuristic
-            for i in range(1, len(clips)):
-                doc.Objects.Delete(clips[i], True)
-            clips = [clips[0]]
+            keep = min(clips, key=lambda c: c.RuntimeSerialNumber)  # oldest in this session
+            extras = [c for c in clips if c is not keep]
+            # One undo record and no intermediate redraws for the whole cleanup
+            serial = doc.BeginUndoRecord("ClipPlane cleanup")
+            redraw = doc.Views.RedrawEnabled
+            doc.Views.RedrawEnabled = False
+            try:
+                for c in extras:
+                    doc.Objects.Delete(c, True)
+            finally:
+                doc.Views.RedrawEnabled = redraw
+                if serial:
+                    doc.EndUndoRecord(serial)
+            clips = [keep]
+            touched = True
 
         if len(clips) == 0:
             return ClipId, "No clipping plane in layer 'Clipping Plane'. Set Create=True to make one on World XY."
@@ -144,12 +182,22 @@ def main(P, Create, Size):
         except:
             current = cgeom.Plane
 
+        # Already aligned: skip the transform (and the redraw unless we changed the doc)
+        if same_plane(current, P):
+            ClipId = clip.Id
+            if touched:
+                doc.Views.Redraw()
+            return ClipId, "Clipping plane unchanged (already at input plane)."
+
+        # Decide on the layer fix up front; attributes are only copied when needed
+        needs_layer_fix = clip.Attributes.LayerIndex != layer_index
+
         xform = Rhino.Geometry.Transform.PlaneToPlane(current, P)
         ok = doc.Objects.Transform(clip.Id, xform, True)
         if not ok:
             # Replace if transform failed
             doc.Objects.Delete(clip, True)
-            nid = create_clip(doc, P, Size, layer_index, vps)
+            nid, _ = create_clip(doc, P, Size, layer_index, vps)
             if nid == System.Guid.Empty:
                 return ClipId, "Failed to reposition; could not recreate."
             ClipId = nid
@@ -157,8 +205,8 @@ def main(P, Create, Size):
             return ClipId, "Recreated clipping plane at input plane."
 
         # Ensure correct layer
-        attr = clip.Attributes
-        if attr.LayerIndex != layer_index:
+        if needs_layer_fix:
+            attr = clip.Attributes.Duplicate()
             attr.LayerIndex = layer_index
             doc.Objects.ModifyAttributes(clip.Id, attr, True)
 
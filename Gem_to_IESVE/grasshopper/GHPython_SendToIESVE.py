@@ -16,11 +16,11 @@ import System
 import clr
 import os
 import time
+import scriptcontext as sc
 from System.Diagnostics import Process, ProcessStartInfo
 
 # ------------- Helper: configure nice names/tooltips on first run -------------
 try:
-    import scriptcontext as sc
     if not sc.sticky.get("SendToIESVE_Configured", False):
         comp = ghenv.Component
 
@@ -63,6 +63,13 @@ def fail(msg):
     ghenv.Component.Message = "Error"
     return msg
 
+def has_exited(proc):
+    """proc.HasExited, or None if it cannot be queried (e.g. VE runs elevated: access denied)."""
+    try:
+        return proc.HasExited
+    except Exception:
+        return None
+
 status = ""
 
 if not run:
@@ -76,17 +83,21 @@ else:
         status = fail("Invalid VE.exe path: {}".format(ve_exe))
     else:
         # Determine AutoHotkey v2 executable and script path
-        # Common AHK v2 install path (adjust if needed)
-        ahk_exe_candidates = [
-            r"C:\Program Files\AutoHotkey\v2\AutoHotkey64.exe",
-            r"C:\Program Files\AutoHotkey\AutoHotkey64.exe",
-            r"C:\Program Files\AutoHotkey\AutoHotkey.exe"
-        ]
-        ahk_exe = None
-        for c in ahk_exe_candidates:
-            if os.path.isfile(c):
-                ahk_exe = c
-                break
+        # (resolved once per session and remembered in sticky)
+        ahk_exe = sc.sticky.get("SendToIESVE_AhkExe")
+        if not ahk_exe or not os.path.isfile(ahk_exe):
+            # Common AHK v2 install path (adjust if needed)
+            ahk_exe_candidates = [
+                r"C:\Program Files\AutoHotkey\v2\AutoHotkey64.exe",
+                r"C:\Program Files\AutoHotkey\AutoHotkey64.exe",
+                r"C:\Program Files\AutoHotkey\AutoHotkey.exe"
+            ]
+            ahk_exe = None
+            for c in ahk_exe_candidates:
+                if os.path.isfile(c):
+                    ahk_exe = c
+                    break
+            sc.sticky["SendToIESVE_AhkExe"] = ahk_exe
 
         if ahk_path and os.path.isfile(ahk_path):
             ahk_script = ahk_path
@@ -100,14 +111,29 @@ else:
             status = fail("AHK script not found: {}. Place iesve_import_gem.ahk and point to it.".format(ahk_script))
         else:
             try:
-                # Launch VE if not already running
-                procs = Process.GetProcessesByName("VE")
-                if procs.Length == 0:
-                    psi = ProcessStartInfo(ve_exe)
-                    psi.UseShellExecute = True
-                    Process.Start(psi)
-                    # give VE a moment to show its window
-                    time.sleep(2.0)
+                # Launch VE if not already running. The handle from the last
+                # run is checked first so the machine-wide lookup is rare.
+                ve_proc = sc.sticky.get("SendToIESVE_VEProc")
+                if ve_proc is None or has_exited(ve_proc) is not False:
+                    if ve_proc is not None:
+                        sc.sticky["SendToIESVE_VEProc"] = None
+                        ve_proc.Dispose()
+                    procs = Process.GetProcessesByName("VE")
+                    if procs.Length == 0:
+                        psi = ProcessStartInfo(ve_exe)
+                        psi.UseShellExecute = True
+                        ve_proc = Process.Start(psi)
+                        # give VE a moment to show its window
+                        time.sleep(2.0)
+                    else:
+                        ve_proc = procs[0]
+                        for other in procs[1:]:
+                            other.Dispose()
+                        if has_exited(ve_proc) is None:
+                            # Not queryable from here; look it up by name each run
+                            ve_proc.Dispose()
+                            ve_proc = None
+                    sc.sticky["SendToIESVE_VEProc"] = ve_proc
 
                 # Start AHK to drive the import (pass GEM path as the sole argument)
                 psi2 = ProcessStartInfo()
@@ -30,10 +30,12 @@ details : Stdout + Stderr from the runner
 gemPath : Path to the created GEM on success
 """
 
-import os, sys, json, tempfile, io
+import os, sys, json, tempfile, io, hashlib, time
 
+import scriptcontext as sc
 from System.Diagnostics import Process, ProcessStartInfo
-from Grasshopper.Kernel import GH_RuntimeMessageLevel
+from System.Text import StringBuilder, UTF8Encoding
+from Grasshopper.Kernel import GH_RuntimeMessageLevel, GH_Document
 
 # Component metadata
 ghenv.Component.Name = "HB Model -> GEM Export (self-contained)"
@@ -50,7 +52,7 @@ except NameError:
     basestring = str
 
 # ---------- Embedded runner source (ASCII only) ----------
-RUNNER_SOURCE_ASCII = r"""# -*- coding: utf-8 -*-
+RUNNER_SOURCE_ASCII = r'''# -*- coding: utf-8 -*-
 """
 hbjson_to_gem.py - HBJSON to GEM converter (stdin-enabled, ASCII-only)
 
@@ -66,8 +68,68 @@ Exit codes:
  4 conversion/write failure
 """
 
-import argparse, os, sys, json, pkgutil, importlib, inspect
+import argparse, os, sys, json, pkgutil, importlib, inspect, functools
 
+try:
+    from honeybee.model import Model
+    _MODEL_IMPORT_ERROR = None
+except Exception as _e:
+    Model = None
+    _MODEL_IMPORT_ERROR = _e
+
+try:
+    # Optional: orjson parses large HBJSON several times faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Where the result of the slow honeybee_ies package walk is remembered
+_WRITER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "hbjson_to_gem", "writer.json")
+
+def _dynamic_writer(obj):
+    def dynamic_call(model, folder, name, _obj=obj):
+        kwargs = {}
+        ps = inspect.signature(_obj).parameters
+        if 'folder' in ps: kwargs['folder'] = folder
+        if 'name' in ps: kwargs['name'] = name
+        result = _obj(model, **kwargs)
+        if isinstance(result, (str, bytes)):
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            path = os.path.join(folder, name + ".gem")
+            with open(path, 'w', encoding='utf-8') as f:
+                if isinstance(result, bytes):
+                    result = result.decode('utf-8', 'replace')
+                f.write(result)
+            return path
+        return result
+    return dynamic_call
+
+def _load_cached_writer():
+    """Resolves the writer found by a previous package walk, or returns None."""
+    try:
+        with open(_WRITER_CACHE, 'r', encoding='utf-8') as f:
+            qualname = json.load(f)["writer"]
+        mod_name, _, fn_name = qualname.rpartition(".")
+        obj = getattr(importlib.import_module(mod_name), fn_name)
+        if callable(obj):
+            return obj, qualname
+    except Exception:
+        pass
+    return None
+
+def _save_cached_writer(qualname):
+    try:
+        folder = os.path.dirname(_WRITER_CACHE)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(_WRITER_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({"writer": qualname}, f)
+    except Exception:
+        pass
+
+@functools.lru_cache(maxsize=1)
 def discover_writer():
     # Preferred: model_to_ies writes file and returns a path
     try:
@@ -91,6 +153,10 @@ def discover_writer():
         return call, 'honeybee_ies.writer.model_to_gem'
     except Exception:
         pass
+    # A writer found by an earlier package walk, if it still resolves
+    cached = _load_cached_writer()
+    if cached:
+        return _dynamic_writer(cached[0]), cached[1]
     # Last resort: search for any function that mentions "gem" and "model"
     try:
         import honeybee_ies
@@ -101,23 +167,9 @@ def discover_writer():
                     if 'gem' in n.lower() and 'model' in n.lower():
                         sig = inspect.signature(obj)
                         if 'model' in sig.parameters:
-                            def dynamic_call(model, folder, name, _obj=obj):
-                                kwargs = {}
-                                ps = inspect.signature(_obj).parameters
-                                if 'folder' in ps: kwargs['folder'] = folder
-                                if 'name' in ps: kwargs['name'] = name
-                                result = _obj(model, **kwargs)
-                                if isinstance(result, (str, bytes)):
-                                    if not os.path.isdir(folder):
-                                        os.makedirs(folder)
-                                    path = os.path.join(folder, name + ".gem")
-                                    with open(path, 'w', encoding='utf-8') as f:
-                                        if isinstance(result, bytes):
-                                            result = result.decode('utf-8', 'replace')
-                                        f.write(result)
-                                    return path
-                                return result
-                            return dynamic_call, "%s.%s" % (mod_name, n)
+                            qualname = "%s.%s" % (mod_name, n)
+                            _save_cached_writer(qualname)
+                            return _dynamic_writer(obj), qualname
             except Exception:
                 continue
     except Exception:
@@ -134,17 +186,16 @@ def main():
     gem_path = os.path.abspath(args.gem)
     log_path = os.path.abspath(args.log) if args.log else None
 
-    try:
-        from honeybee.model import Model
-    except Exception as e:
-        print("ERROR: Cannot import honeybee Model (%s)" % e, file=sys.stderr)
+    if Model is None:
+        print("ERROR: Cannot import honeybee Model (%s)" % _MODEL_IMPORT_ERROR, file=sys.stderr)
         sys.exit(3)
 
     # Build model
     if args.hbjson.strip() == "-":
         try:
-            raw = sys.stdin.read()
-            data = json.loads(raw)
+            # Raw UTF-8 bytes: both parsers decode them, no intermediate str
+            raw = sys.stdin.buffer.read()
+            data = _json_loads(raw)
         except Exception as e:
             print("ERROR: Failed to read/parse HBJSON from STDIN (%s)" % e, file=sys.stderr)
             sys.exit(2)
@@ -202,25 +253,41 @@ def main():
 
 if __name__ == "__main__":
     main()
-"""
+'''
+
+_RUNNER_LEN = len(RUNNER_SOURCE_ASCII)
+_RUNNER_SHA1 = hashlib.sha1(RUNNER_SOURCE_ASCII.encode("ascii")).hexdigest()
 
 # ---------- Helpers ----------
 def _msg(level, text):
     ghenv.Component.AddRuntimeMessage(level, text)
 
 def _is_blank(s):
+    if s is None:
+        return True
+    if isinstance(s, basestring):
+        # O(1) for large JSON strings: isspace() stops at the first non-space char
+        return len(s) == 0 or s.isspace()
     try:
-        return s is None or str(s).strip() == ""
+        return str(s).strip() == ""
     except Exception:
         return True
 
 def _find_default_python():
+    # Per-session constant; the caller still checks the file exists
+    cached = sc.sticky.get("HB2GEM_LbtPython")
+    if cached:
+        return cached
     env_py = os.environ.get('LBT_PYTHON')
     if env_py and os.path.isfile(env_py):
-        return env_py
-    lbt_home = os.environ.get('LBT_HOME', r"C:\Program Files\ladybug_tools")
-    candidate = os.path.join(lbt_home, "python", "python.exe")
-    return candidate if os.path.isfile(candidate) else None
+        found = env_py
+    else:
+        lbt_home = os.environ.get('LBT_HOME', r"C:\Program Files\ladybug_tools")
+        candidate = os.path.join(lbt_home, "python", "python.exe")
+        found = candidate if os.path.isfile(candidate) else None
+    if found:
+        sc.sticky["HB2GEM_LbtPython"] = found
+    return found
 
 def _quote(s):
     s = str(s)
@@ -228,76 +295,163 @@ def _quote(s):
         s = s.replace('"', r'\"')
     return '"' + s + '"'
 
-def _build_args_stdin(py_file, gem_path, log_path):
-    args = [_quote(py_file), "--hbjson", "-", "--gem", _quote(gem_path)]
-    if not _is_blank(log_path):
-        args += ["--log", _quote(log_path)]
-    return " ".join(args)
-
-def _build_args_file(py_file, hbjson_path_or_json, gem_path, log_path):
-    # If the provided string is a JSON string, we pass it via STDIN anyway.
-    if hbjson_path_or_json and str(hbjson_path_or_json).lstrip().startswith("{"):
-        return None  # signal to caller to use STDIN instead
-    args = [_quote(py_file), "--hbjson", _quote(hbjson_path_or_json), "--gem", _quote(gem_path)]
-    if not _is_blank(log_path):
-        args += ["--log", _quote(log_path)]
-    return " ".join(args)
+def _line_collector(sb):
+    """DataReceived handler appending each line to sb (Data is None at EOF)."""
+    def handler(sender, e):
+        if e.Data is not None:
+            sb.AppendLine(e.Data)
+    return handler
 
 def _materialize_runner_to_temp():
-    """Write the runner script to TEMP with UTF-8 encoding, return its path or error."""
+    """Write the runner script to TEMP with UTF-8 encoding, return its path or error.
+
+    The file is written once per session; later calls reuse it as long as it
+    was written from this exact source and still has the expected size.
+    """
+    cached = sc.sticky.get("HB2GEM_RunnerPath")
+    if cached and cached[1] == _RUNNER_SHA1:
+        path = cached[0]
+        if os.path.isfile(path) and os.path.getsize(path) == _RUNNER_LEN:
+            return path, None
     temp_dir = tempfile.gettempdir()
     path = os.path.join(temp_dir, "hbjson_to_gem.py")
     try:
         with io.open(path, "w", encoding="utf-8", newline="\n") as f:
             f.write(RUNNER_SOURCE_ASCII)
+        sc.sticky["HB2GEM_RunnerPath"] = (path, _RUNNER_SHA1)
         return path, None
     except Exception as e:
         return None, "Failed to write runner to TEMP: {0}".format(e)
 
-def _serialize_obj_to_hbjson_text(obj):
-    """Try to produce HBJSON text from a variety of possible GH inputs."""
-    # 1) Already a string (must be JSON)
+_SERIALIZE_ERR = ("Could not serialize the provided HB model to HBJSON text. "
+                  "Try feeding a Honeybee 'Dump/To JSON' into _hb_model or use _hbjson as a file path or JSON string.")
+
+_UTF8 = UTF8Encoding(False)  # no BOM
+_STDIN_BLOCK = 65536
+
+def _write_utf8(bs, text):
+    """Encode text as UTF-8 and write the bytes to a .NET Stream."""
+    raw = _UTF8.GetBytes(text)
+    bs.Write(raw, 0, raw.Length)
+
+def _json_writer(obj):
+    """Return writer(sink) that streams obj as JSON text to sink in ~64 KB blocks."""
+    def writer(sink):
+        buf, size = [], 0
+        for chunk in json.JSONEncoder(ensure_ascii=True).iterencode(obj):
+            buf.append(chunk)
+            size += len(chunk)
+            if size >= _STDIN_BLOCK:
+                sink("".join(buf))
+                buf, size = [], 0
+        if buf:
+            sink("".join(buf))
+    return writer
+
+def _feed(payload, sink):
+    """Send a payload (JSON text or a _json_writer) to sink as text blocks."""
+    if callable(payload):
+        payload(sink)
+    else:
+        sink(payload)
+
+def _input_key(payload, hbjson_file):
+    """Cheap identity of the HBJSON input for the skip-run check.
+
+    JSON text: SHA1 of its UTF-8 bytes. File: path, mtime and size.
+    Streamed model (a _json_writer): None, never skipped. Hashing it would
+    need a second full encode (the slowest step of an export) or the whole
+    text held in memory, and the object itself may have been edited in place.
+    """
+    if callable(payload):
+        return None
+    if payload is not None:
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    st = os.stat(hbjson_file)
+    return u"file|%s|%r|%d" % (hbjson_file, st.st_mtime, st.st_size)
+
+_VERIFY_JSON_MAX = 65536
+
+def _checked_json_text(s):
+    """Return s if it is a JSON object, else None.
+
+    Only strings under 64 KB are fully parsed; larger ones get the brace check
+    and the runner (which parses them anyway) reports bad JSON with exit code 2.
+    """
+    s = s.strip()
+    if not (s.startswith("{") and s.endswith("}")):
+        return None
+    if len(s) < _VERIFY_JSON_MAX:
+        try:
+            json.loads(s)
+        except Exception:
+            return None
+    return s
+
+_FAST_PROBES = ("to_dict", "ToDict", "ToJson")
+_SLOW_PROBES = ("ToJSON", "ToJsonString", "ToJsonText",
+                "ToHBJSON", "ToDictionary", "ToPython", "ToString")
+
+def _probe_result_to_payload(res):
+    """Turn a probe method's return value into a payload, or None if it isn't HBJSON."""
+    if isinstance(res, dict):
+        return _json_writer(res)
+    if isinstance(res, basestring):
+        return _checked_json_text(res)
     try:
-        if isinstance(obj, basestring):
-            s = obj.strip()
-            if s.startswith("{") and s.endswith("}"):
-                json.loads(s)  # sanity check
-                return s, None
+        if hasattr(res, "keys"):
+            return json.dumps(res)
     except Exception:
         pass
-    # 2) Plain Python dict (or dict-like)
+    return None
+
+def _serialize_obj_to_hbjson_text(obj):
+    """Try to produce HBJSON text from a variety of possible GH inputs.
+
+    Returns (payload, error). payload is either the JSON text, or, for
+    Python dicts, a writer(sink) callable that streams the JSON so the
+    full string is never built in memory.
+    """
+    # Cheap isinstance checks first; attribute probes on .NET objects are slow.
+    # 1) Plain Python dict
+    if isinstance(obj, dict):
+        return _json_writer(obj), None
+    # 2) Already a string (must be JSON); a string never has the probe methods below
+    if isinstance(obj, basestring):
+        s = _checked_json_text(obj)
+        return (s, None) if s is not None else (None, _SERIALIZE_ERR)
+    # 3) Other dict-like objects
     try:
         if hasattr(obj, "keys"):  # very generic check
             return json.dumps(obj), None
     except Exception:
         pass
-    # 3) .NET or wrapper objects with serialization methods
-    probe_methods = [
-        "ToJson", "ToJSON", "ToJsonString", "ToJsonText",
-        "ToHBJSON", "ToDict", "ToDictionary", "ToPython",
-        "ToString"
-    ]
-    for m in probe_methods:
+    # 4) Known serializers (Honeybee models expose to_dict): one getattr each
+    for m in _FAST_PROBES:
+        fn = getattr(obj, m, None)
+        if fn is None:
+            continue
+        try:
+            res = fn()
+        except TypeError:
+            res = fn  # a property rather than a method
+        except Exception:
+            continue
+        payload = _probe_result_to_payload(res)
+        if payload is not None:
+            return payload, None
+    # 5) Other .NET or wrapper objects with serialization methods
+    for m in _SLOW_PROBES:
         try:
             if hasattr(obj, m):
                 res = getattr(obj, m)
                 res = res() if callable(res) else res
-                try:
-                    if hasattr(res, "keys"):
-                        return json.dumps(res), None
-                except Exception:
-                    pass
-                if isinstance(res, basestring):
-                    s = res.strip()
-                    try:
-                        json.loads(s)
-                        return s, None
-                    except Exception:
-                        continue
+                payload = _probe_result_to_payload(res)
+                if payload is not None:
+                    return payload, None
         except Exception:
             pass
-    return None, ("Could not serialize the provided HB model to HBJSON text. "
-                  "Try feeding a Honeybee 'Dump/To JSON' into _hb_model or use _hbjson as a file path or JSON string.")
+    return None, _SERIALIZE_ERR
 
 # ---------- Outputs ----------
 status = "READY"
@@ -326,6 +480,9 @@ if globals().get("_export", False):
         py_path = None if (pythonPath_val is None or _is_blank(pythonPath_val)) else str(pythonPath_val).strip()
         if not py_path:
             py_path = _find_default_python()
+            if py_path and not os.path.isfile(py_path):
+                sc.sticky.pop("HB2GEM_LbtPython", None)  # moved/uninstalled; probe again
+                py_path = _find_default_python()
         if not py_path or not os.path.isfile(py_path):
             _msg(GH_RuntimeMessageLevel.Error, "Ladybug Tools Python not found. Provide pythonPath or set LBT_HOME/LBT_PYTHON.")
             status = "ERROR"
@@ -348,7 +505,7 @@ if globals().get("_export", False):
                 status = "ERROR"
             else:
                 run_path = auto_path
-                _msg(GH_RuntimeMessageLevel.Remark, "Runner created at TEMP: {0}".format(run_path))
+                _msg(GH_RuntimeMessageLevel.Remark, "Using runner at TEMP: {0}".format(run_path))
 
     wait_seconds = 300
     if status != "ERROR":
@@ -388,40 +545,82 @@ if globals().get("_export", False):
         psi.FileName = py_path
         log_arg = None if (logFile_val is None or _is_blank(logFile_val)) else str(logFile_val).strip()
 
-        if using_stdin:
-            psi.Arguments = " ".join([_quote(run_path), "--hbjson", "-", "--gem", _quote(gem_path)] + (["--log", _quote(log_arg)] if log_arg else []))
-        else:
-            if hbjson_path_or_json and hbjson_path_or_json.lstrip().startswith("{"):
-                stdin_payload = hbjson_path_or_json
-                using_stdin = True
-                psi.Arguments = " ".join([_quote(run_path), "--hbjson", "-", "--gem", _quote(gem_path)] + (["--log", _quote(log_arg)] if log_arg else []))
-            else:
-                if not os.path.isfile(hbjson_path_or_json):
-                    _msg(GH_RuntimeMessageLevel.Error, "Fallback _hbjson file not found: {0}".format(hbjson_path_or_json))
-                    status = "ERROR"
-                psi.Arguments = " ".join([_quote(run_path), "--hbjson", _quote(hbjson_path_or_json), "--gem", _quote(gem_path)] + (["--log", _quote(log_arg)] if log_arg else []))
-
+        if not using_stdin and hbjson_path_or_json and hbjson_path_or_json.lstrip().startswith("{"):
+            stdin_payload = hbjson_path_or_json
+            using_stdin = True
+        if not using_stdin and not os.path.isfile(hbjson_path_or_json):
+            _msg(GH_RuntimeMessageLevel.Error, "Fallback _hbjson file not found: {0}".format(hbjson_path_or_json))
+            status = "ERROR"
+        argv = ["-B", _quote(run_path), "--hbjson", "-" if using_stdin else _quote(hbjson_path_or_json),
+                "--gem", _quote(gem_path)]
+        if log_arg:
+            argv += ["--log", _quote(log_arg)]
+        psi.Arguments = " ".join(argv)
+
+        # Skip the runner when this exact JSON text / file was already exported
+        # to an untouched gem_path (streamed models always run, see _input_key)
+        skip_run = False
+        run_key = ("HB2GEM_LastRun", gem_path)
+        run_tools = (py_path, run_path)
+        input_key = None
         if status != "ERROR":
+            try:
+                input_key = _input_key(stdin_payload if using_stdin else None, hbjson_path_or_json)
+                last = sc.sticky.get(run_key)
+                if (input_key is not None and last and last[:2] == (run_tools, input_key)
+                        and os.path.isfile(gem_path) and os.path.getmtime(gem_path) == last[2]):
+                    skip_run = True
+                    status = "OK"
+                    gemPath = gem_path
+                    details = "cached (unchanged input)"
+                    _msg(GH_RuntimeMessageLevel.Remark, "Input unchanged since last export; kept existing GEM:\n{0}".format(gem_path))
+            except Exception:
+                input_key = None
+
+        if status != "ERROR" and not skip_run:
             psi.UseShellExecute = False
             psi.RedirectStandardOutput = True
             psi.RedirectStandardError = True
             psi.CreateNoWindow = True
             psi.WorkingDirectory = os.path.dirname(gem_path) if os.path.dirname(gem_path) else os.getcwd()
             psi.RedirectStandardInput = using_stdin
+            # STDIN is sent as raw UTF-8 bytes; have the runner decode it (and
+            # print) as UTF-8, and read its output back the same way
+            psi.EnvironmentVariables["PYTHONIOENCODING"] = "utf-8"
+            # One-shot run: don't try to write .pyc files next to the runner/packages
+            psi.EnvironmentVariables["PYTHONDONTWRITEBYTECODE"] = "1"
+            psi.StandardOutputEncoding = _UTF8
+            psi.StandardErrorEncoding = _UTF8
+            if using_stdin:
+                try:
+                    psi.StandardInputEncoding = _UTF8  # .NET Core / Rhino 8 only
+                except Exception:
+                    pass
 
             proc = None
+            out_sb = StringBuilder()
+            err_sb = StringBuilder()
             try:
                 proc = Process()
                 proc.StartInfo = psi
+                # Drain stdout/stderr while the runner works so a full pipe never stalls it
+                proc.OutputDataReceived += _line_collector(out_sb)
+                proc.ErrorDataReceived += _line_collector(err_sb)
                 if not proc.Start():
                     status = "ERROR"
                     details = "Failed to start external Python process."
                     _msg(GH_RuntimeMessageLevel.Error, details)
                 else:
+                    proc.BeginOutputReadLine()
+                    proc.BeginErrorReadLine()
                     if using_stdin:
                         try:
+                            # Bypass the StreamWriter's char path and write encoded bytes
                             sw = proc.StandardInput
-                            sw.Write(stdin_payload)
+                            sw.Flush()
+                            bs = sw.BaseStream
+                            _feed(stdin_payload, lambda t: _write_utf8(bs, t))
+                            bs.Flush()
                             sw.Close()
                         except Exception as e:
                             status = "ERROR"
@@ -429,23 +628,30 @@ if globals().get("_export", False):
                             _msg(GH_RuntimeMessageLevel.Error, details)
 
                     if status != "ERROR":
-                        if not proc.WaitForExit(wait_seconds * 1000):
-                            try:
-                                proc.Kill()
-                            except Exception:
-                                pass
+                        # Poll in short slices so Esc can abort a long export
+                        deadline = time.time() + wait_seconds
+                        stop_reason = None
+                        while not proc.HasExited:
+                            if time.time() > deadline:
+                                stop_reason = "Process timed out after {0} seconds. Increase 'timeout' for large models.".format(wait_seconds)
+                            elif GH_Document.IsEscapeKeyDown():
+                                stop_reason = "Export cancelled (Esc pressed)."
+                            if stop_reason:
+                                try:
+                                    proc.Kill()
+                                except Exception:
+                                    pass
+                                break
+                            time.sleep(0.05)
+                        if stop_reason:
                             status = "ERROR"
-                            details = "Process timed out after {0} seconds. Increase 'timeout' for large models.".format(wait_seconds)
+                            details = stop_reason
                             _msg(GH_RuntimeMessageLevel.Error, details)
                         else:
-                            try:
-                                stdout_txt = proc.StandardOutput.ReadToEnd()
-                            except Exception:
-                                stdout_txt = ""
-                            try:
-                                stderr_txt = proc.StandardError.ReadToEnd()
-                            except Exception:
-                                stderr_txt = ""
+                            # The untimed wait returns once the async readers hit EOF
+                            proc.WaitForExit()
+                            stdout_txt = out_sb.ToString()
+                            stderr_txt = err_sb.ToString()
                             details = (stdout_txt or "") + (("\nErrors:\n" + stderr_txt) if stderr_txt else "")
                             if proc.ExitCode != 0:
                                 status = "ERROR"
@@ -454,6 +660,10 @@ if globals().get("_export", False):
                                 status = "OK"
                                 gemPath = gem_path
                                 _msg(GH_RuntimeMessageLevel.Remark, "HB model exported to GEM:\n{0}".format(gem_path))
+                                if input_key and os.path.isfile(gem_path):
+                                    sc.sticky[run_key] = (run_tools, input_key, os.path.getmtime(gem_path))
+                                else:
+                                    sc.sticky.pop(run_key, None)
             except Exception as e:
                 status = "ERROR"
                 details = "Failed to execute external process: {0}".format(e)
@@ -14,8 +14,68 @@ Exit codes:
  4 conversion/write failure
 """
 
-import argparse, os, sys, json, pkgutil, importlib, inspect
+import argparse, os, sys, json, pkgutil, importlib, inspect, functools
 
+try:
+    from honeybee.model import Model
+    _MODEL_IMPORT_ERROR = None
+except Exception as _e:
+    Model = None
+    _MODEL_IMPORT_ERROR = _e
+
+try:
+    # Optional: orjson parses large HBJSON several times faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Where the result of the slow honeybee_ies package walk is remembered
+_WRITER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "hbjson_to_gem", "writer.json")
+
+def _dynamic_writer(obj):
+    def dynamic_call(model, folder, name, _obj=obj):
+        kwargs = {}
+        ps = inspect.signature(_obj).parameters
+        if 'folder' in ps: kwargs['folder'] = folder
+        if 'name' in ps: kwargs['name'] = name
+        result = _obj(model, **kwargs)
+        if isinstance(result, (str, bytes)):
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            path = os.path.join(folder, name + ".gem")
+            with open(path, 'w', encoding='utf-8') as f:
+                if isinstance(result, bytes):
+                    result = result.decode('utf-8', 'replace')
+                f.write(result)
+            return path
+        return result
+    return dynamic_call
+
+def _load_cached_writer():
+    """Resolves the writer found by a previous package walk, or returns None."""
+    try:
+        with open(_WRITER_CACHE, 'r', encoding='utf-8') as f:
+            qualname = json.load(f)["writer"]
+        mod_name, _, fn_name = qualname.rpartition(".")
+        obj = getattr(importlib.import_module(mod_name), fn_name)
+        if callable(obj):
+            return obj, qualname
+    except Exception:
+        pass
+    return None
+
+def _save_cached_writer(qualname):
+    try:
+        folder = os.path.dirname(_WRITER_CACHE)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(_WRITER_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({"writer": qualname}, f)
+    except Exception:
+        pass
+
+@functools.lru_cache(maxsize=1)
 def discover_writer():
     # Preferred: model_to_ies writes file and returns a path
     try:
@@ -39,6 +99,10 @@ def discover_writer():
         return call, 'honeybee_ies.writer.model_to_gem'
     except Exception:
         pass
+    # A writer found by an earlier package walk, if it still resolves
+    cached = _load_cached_writer()
+    if cached:
+        return _dynamic_writer(cached[0]), cached[1]
     # Last resort: search for any function that mentions "gem" and "model"
     try:
         import honeybee_ies
@@ -49,23 +113,9 @@ def discover_writer():
                     if 'gem' in n.lower() and 'model' in n.lower():
                         sig = inspect.signature(obj)
                         if 'model' in sig.parameters:
-                            def dynamic_call(model, folder, name, _obj=obj):
-                                kwargs = {}
-                                ps = inspect.signature(_obj).parameters
-                                if 'folder' in ps: kwargs['folder'] = folder
-                                if 'name' in ps: kwargs['name'] = name
-                                result = _obj(model, **kwargs)
-                                if isinstance(result, (str, bytes)):
-                                    if not os.path.isdir(folder):
-                                        os.makedirs(folder)
-                                    path = os.path.join(folder, name + ".gem")
-                                    with open(path, 'w', encoding='utf-8') as f:
-                                        if isinstance(result, bytes):
-                                            result = result.decode('utf-8', 'replace')
-                                        f.write(result)
-                                    return path
-                                return result
-                            return dynamic_call, "%s.%s" % (mod_name, n)
+                            qualname = "%s.%s" % (mod_name, n)
+                            _save_cached_writer(qualname)
+                            return _dynamic_writer(obj), qualname
             except Exception:
                 continue
     except Exception:
@@ -82,17 +132,16 @@ def main():
     gem_path = os.path.abspath(args.gem)
     log_path = os.path.abspath(args.log) if args.log else None
 
-    try:
-        from honeybee.model import Model
-    except Exception as e:
-        print("ERROR: Cannot import honeybee Model (%s)" % e, file=sys.stderr)
+    if Model is None:
+        print("ERROR: Cannot import honeybee Model (%s)" % _MODEL_IMPORT_ERROR, file=sys.stderr)
         sys.exit(3)
 
     # Build model
     if args.hbjson.strip() == "-":
         try:
-            raw = sys.stdin.read()
-            data = json.loads(raw)
+            # Raw UTF-8 bytes: both parsers decode them, no intermediate str
+            raw = sys.stdin.buffer.read()
+            data = _json_loads(raw)
         except Exception as e:
             print("ERROR: Failed to read/parse HBJSON from STDIN (%s)" % e, file=sys.stderr)
             sys.exit(2)
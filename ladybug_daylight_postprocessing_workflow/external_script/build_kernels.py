@@ -0,0 +1,43 @@
+"""
+Build the ahead-of-time compiled room kernel used by
+post_process_daylight_all_grids.py.
+
+Numba normally compiles the fused room kernel the first time a process needs
+it, which adds the numba import and JIT warm-up to every fresh run. This
+script compiles the same kernel once into an extension module,
+daylight_kernels (.pyd on Windows), placed next to this file. The
+post-processing script imports it when present and then needs neither numba
+nor a compiler at run time, only NumPy.
+
+USAGE (once, in the same Python environment that runs the analysis;
+requires numba and a C compiler):
+  python build_kernels.py
+
+Rebuild after editing the kernel or upgrading Python/NumPy. Delete the
+daylight_kernels file to go back to the JIT (or plain NumPy) path.
+
+The compiled kernel is serial, so it is used where rooms already run one per
+process (the pool workers), or when numba is not installed. A single room in
+the main process, with numba available, still uses the JIT kernel, which
+spreads its tiles over the cores.
+"""
+
+import os
+from numba.pycc import CC
+
+from post_process_daylight_all_grids import _fused_room_pass
+
+cc = CC('daylight_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# arr, thresholds, strict, counts, partial, tile: one export per grid dtype
+# (float32 results, uint16 cache). Thresholds arrive in the dtype that
+# _kernel_thresholds produces for that grid. All arrays are declared
+# C-contiguous: with generic layouts the compiled loops do not vectorise.
+SIGNATURE = 'void({}[:, ::1], {}[::1], b1[::1], i4[:, ::1], f4[:, ::1], i8)'
+for dtype, thr_dtype in (('f4', 'f4'), ('u2', 'f8')):
+    cc.export('room_pass_' + dtype, SIGNATURE.format(dtype, thr_dtype))(_fused_room_pass)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"[OK] Built daylight_kernels in {cc.output_dir}")
@@ -8,15 +8,48 @@ USAGE (6 arguments required):
          <results_folder> <min_lux> <min_hours_req> \
          <avg_lux> <avg_hours_req> <udi_min_lux>
 
+WORKER MODE (used by the Grasshopper Runner to avoid a new interpreter per run):
+  python post_process_daylight_all_grids.py --serve
+  Reads one JSON job per line on stdin, with the keys
+  results_folder, min_lux, min_hours_req, avg_lux, avg_hours_req, udi_min_lux,
+  and answers each with one JSON line {"ok": true/false, "log": "..."} on stdout.
+
 Output:
   Writes daylight_summary.json inside <results_folder>
 """
 
+import io
+import os
 import sys
 import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
 from pathlib import Path
 import numpy as np
 
+try:
+    # Optional: fused single-pass kernel. Without numba the NumPy path is used.
+    import numba
+    from numba import njit, prange
+except ImportError:
+    numba = None
+    prange = range
+
+try:
+    # Optional: the fused kernel compiled ahead of time by build_kernels.py.
+    # Used before the numba JIT, so no compile/cache-load happens at run time.
+    import daylight_kernels
+except ImportError:
+    daylight_kernels = None
+
+try:
+    # Optional: faster summary writer. Without orjson the json module is used.
+    import orjson
+except ImportError:
+    orjson = None
+
 def find_npy_files(root_path: Path):
     """Finds all .npy result files within the simulation folder."""
     npy_folder = root_path / 'results' / '__static_apertures__' / 'default' / 'total'
@@ -27,14 +60,393 @@ def find_npy_files(root_path: Path):
             "Please ensure the simulation ran correctly and created .npy files."
         )
 
-    npy_files = list(npy_folder.glob('*.npy'))
+    # Sorted so room order (and the worst-room tie-break) is the same on every OS
+    npy_files = sorted(npy_folder.glob('*.npy'))
     if not npy_files:
         raise FileNotFoundError(f"No .npy files found in {npy_folder}")
     
     return npy_files
 
-def main():
-    if len(sys.argv) != 7:
+# Smallest possible .npy file: the header alone is padded to 128 bytes, so
+# anything shorter holds no data (e.g. a file still being written).
+MIN_NPY_BYTES = 128
+
+def npy_shape(npy_file):
+    """Reads only the .npy header; returns the array shape, or None if unreadable."""
+    try:
+        with open(npy_file, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, _, _ = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, _, _ = np.lib.format.read_array_header_2_0(f)
+        return shape
+    except Exception:
+        return None
+
+# Opt-in: keep a uint16 copy of each grid (whole lux, clipped to 0-65535) in
+# a _uint16_cache folder next to the .npy files and analyse that instead.
+# Later runs read half the bytes, but every value is rounded to the nearest
+# lux, so an hour within 0.5 lux of a threshold may be counted differently.
+USE_UINT16_CACHE = False
+UINT16_CACHE_DIR = "_uint16_cache"
+
+def _fresh_uint16_copy(npy_file):
+    """Path of an up-to-date uint16 cache file for npy_file, or None."""
+    if not USE_UINT16_CACHE:
+        return None
+    cached = npy_file.parent / UINT16_CACHE_DIR / npy_file.name
+    try:
+        if cached.stat().st_mtime >= npy_file.stat().st_mtime:
+            return cached
+    except OSError:
+        pass
+    return None
+
+# Rows converted per block when writing the uint16 cache, so the float
+# temporaries stay a few MB instead of the size of the whole grid.
+UINT16_BLOCK_ROWS = 256
+
+def _to_uint16(arr, out):
+    """Writes arr rounded and clipped to 0-65535 into the uint16 array out."""
+    rows = min(UINT16_BLOCK_ROWS, arr.shape[0])
+    buf = np.empty((rows,) + arr.shape[1:], np.result_type(arr.dtype, np.float32))
+    for a in range(0, arr.shape[0], UINT16_BLOCK_ROWS):
+        block = buf[:min(UINT16_BLOCK_ROWS, arr.shape[0] - a)]
+        np.clip(arr[a:a + len(block)], 0, 65535, out=block)
+        np.rint(block, out=block)
+        out[a:a + len(block)] = block
+
+def load_grid(npy_file):
+    """Memory-maps a room's grid (points x hours), via the uint16 cache if enabled."""
+    cached = _fresh_uint16_copy(npy_file)
+    if cached is not None:
+        return np.load(cached, mmap_mode='r')
+    arr = np.load(npy_file, mmap_mode='r')
+    if not USE_UINT16_CACHE:
+        return arr
+    cached = npy_file.parent / UINT16_CACHE_DIR / npy_file.name
+    tmp = cached.with_suffix(".tmp.npy")
+    try:
+        cached.parent.mkdir(exist_ok=True)
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.uint16, shape=arr.shape)
+    except OSError:
+        # read-only results folder: just use a converted copy this run
+        out = np.empty(arr.shape, np.uint16)
+        _to_uint16(arr, out)
+        return out
+    _to_uint16(arr, out)
+    out.flush()
+    del out  # close the map before the rename (Windows refuses otherwise)
+    tmp.replace(cached)
+    return np.load(cached, mmap_mode='r')
+
+PREFETCH_CHUNK = 1 << 20
+
+def _prefetch(paths, stop, ahead):
+    """Pulls files into the OS page cache, in the order they will be analysed,
+    so the pool workers' memory maps mostly hit cached pages.
+
+    Each file first takes a slot from the semaphore `ahead`, and run_analysis
+    hands one back per finished room. Read-ahead therefore stays a bounded
+    number of files past the completed ones: a results set larger than RAM
+    cannot evict pages the workers have not reached yet.
+
+    Linux/macOS ask the kernel for read-ahead (posix_fadvise); elsewhere the
+    file is read in PREFETCH_CHUNK blocks and discarded.
+    """
+    for path in paths:
+        ahead.acquire()
+        if stop.is_set():
+            return
+        try:
+            if hasattr(os, "posix_fadvise"):
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            else:
+                with open(path, 'rb', buffering=0) as f:
+                    while not stop.is_set() and f.read(PREFETCH_CHUNK):
+                        pass
+        except OSError:
+            pass  # analyze_room reports unreadable files
+
+# Points per tile in the fused kernel. Each tile owns one float32 hourly
+# accumulator row (8760 x 4 B = 35 KB for an annual run), which stays resident
+# in L1/L2 while the tile's points stream past it; tiles are spread over the
+# cores. A row only ever sums TILE_POINTS values, so float32 rounding stays
+# around 1e-5 relative however large the grid is; the rows are combined in
+# float64.
+TILE_POINTS = 512
+
+def _fused_room_pass(arr, thresholds, strict, counts, partial, tile):
+    """Single streaming pass over arr (points x hours).
+
+    counts[t, p] receives the number of hours point p meets thresholds[t]
+    (v > threshold when strict[t], else v >= threshold). Points are processed
+    in tiles of `tile` rows run in parallel; tile b adds its hourly
+    illuminance into its own row partial[b] (no shared writes).
+
+    Each point's row (35 KB for an annual run) is read from memory once and
+    then re-scanned from cache per threshold; every hour loop is innermost
+    and branch-free (the comparison adds 0/1), so it compiles to SIMD.
+    """
+    n_points, n_hours = arr.shape
+    n_thr = thresholds.shape[0]
+    n_tiles = partial.shape[0]
+    for b in prange(n_tiles):
+        acc = partial[b]
+        for p in range(b * tile, min((b + 1) * tile, n_points)):
+            row = arr[p]
+            for h in range(n_hours):
+                acc[h] += row[h]
+            for t in range(n_thr):
+                thr = thresholds[t]
+                c = 0
+                if strict[t]:
+                    for h in range(n_hours):
+                        c += row[h] > thr
+                else:
+                    for h in range(n_hours):
+                        c += row[h] >= thr
+                counts[t, p] = c
+
+if numba is not None:
+    _fused_room_kernel = njit(parallel=True, cache=True)(_fused_room_pass)
+
+def _kernel_thresholds(dtype, thresholds, strict):
+    """Thresholds for the compiled kernel, in the grid's dtype for float32 grids.
+
+    Comparing float32 with float32 doubles the SIMD width. The conversion is
+    exact: v >= t <=> v >= (smallest float32 >= t) and
+    v > t <=> v > (largest float32 <= t) for every float32 v.
+    """
+    if dtype != np.float32:
+        return thresholds
+    t32 = thresholds.astype(np.float32)
+    up = np.where(t32 < thresholds, np.nextafter(t32, np.float32(np.inf)), t32)
+    down = np.where(t32 > thresholds, np.nextafter(t32, np.float32(-np.inf)), t32)
+    return np.where(strict, down, up)
+
+# Set in pool workers, which analyse one room per process
+_IN_POOL_WORKER = False
+
+def _room_kernel(arr):
+    """Compiled fused kernel for arr, or None (use the NumPy fallback).
+
+    The numba JIT kernel tiles a room over all cores, so the main process
+    uses it when numba is installed. Pool workers (one room per core, numba
+    pinned to one thread) prefer the serial AOT build when it covers arr's
+    dtype: same code, without the per-process JIT cache load.
+    """
+    if numba is not None and not _IN_POOL_WORKER:
+        return _fused_room_kernel
+    if daylight_kernels is not None and arr.dtype.isnative and arr.flags.c_contiguous:
+        kernel = getattr(daylight_kernels, "room_pass_" + arr.dtype.str[1:], None)
+        if kernel is not None:
+            return kernel
+    return _fused_room_kernel if numba is not None else None
+
+# Per-process scratch arrays reused from room to room (pool workers take the
+# largest rooms first, so they are normally sized once). Only per-point and
+# per-hour buffers live here: they stay small (well under 1 MB for 10k
+# points) while the worker and its pool idle between --serve jobs.
+_SCRATCH = {}
+
+def _scratch(name, shape, dtype):
+    """Uninitialised array of shape/dtype backed by a reusable buffer."""
+    size = int(np.prod(shape))
+    buf = _SCRATCH.get(name)
+    if buf is None or buf.dtype != dtype or buf.size < size:
+        buf = _SCRATCH[name] = np.empty(size, dtype)
+    return buf[:size].reshape(shape)
+
+def threshold_counts(arr, thresholds, strict):
+    """Per-point hour counts for each threshold plus the hourly spatial average.
+
+    Returns (counts, hourly_spatial_average) where counts has shape
+    (len(thresholds), n_points). Repeated (threshold, strict) pairs, e.g.
+    avg_lux == min_lux, are counted once and share their row. The arrays
+    returned live in scratch buffers and are only valid until the next call.
+    """
+    pairs = list(zip(thresholds, strict))
+    unique = list(dict.fromkeys(pairs))
+    n_points, n_hours = arr.shape
+    thresholds = np.asarray([t for t, _ in unique], dtype=np.float64)
+    strict = np.asarray([s for _, s in unique], dtype=np.bool_)
+    counts = _scratch("counts", (thresholds.shape[0], n_points), np.int32)
+    hourly_spatial_average = _scratch("hourly", (n_hours,), np.float64)
+    kernel = _room_kernel(arr)
+    if kernel is not None:
+        n_tiles = (n_points + TILE_POINTS - 1) // TILE_POINTS
+        partial = _scratch("partial", (n_tiles, n_hours), np.float32)
+        partial.fill(0)
+        kernel(arr, _kernel_thresholds(arr.dtype, thresholds, strict), strict,
+               counts, partial, TILE_POINTS)
+        np.add.reduce(partial, axis=0, dtype=np.float64, out=hourly_spatial_average)
+    else:
+        # NumPy fallback: one pass over arr per threshold, through one mask
+        # shared by the thresholds. Grid-sized, so it is freed with the room
+        # rather than kept in _SCRATCH.
+        mask = np.empty(arr.shape, np.bool_)
+        for row, t, s in zip(counts, thresholds, strict):
+            (np.greater if s else np.greater_equal)(arr, t, out=mask)
+            np.add.reduce(mask, axis=1, dtype=np.int32, out=row)
+        np.add.reduce(arr, axis=0, dtype=np.float64, out=hourly_spatial_average)
+    hourly_spatial_average /= n_points
+    if len(unique) < len(pairs):
+        counts = counts[[unique.index(p) for p in pairs]]
+    return counts, hourly_spatial_average
+
+# Upper UDI-a boundary as a bin edge: the a bin is closed at 3000 lux
+UDI_TOP_EDGE = np.nextafter(3000.0, np.inf)
+
+def udi_hours(hourly_spatial_average, udi_min_lux):
+    """UDI hour counts (f, s, a, e) from one binning pass over the hourly average.
+
+    f: < 100, s: 100 to < udi_min_lux (0 unless udi_min_lux > 100),
+    a: udi_min_lux to 3000 inclusive, e: > 3000. The bins are the half-open
+    intervals between the sorted cut points; each count adds up the bins
+    inside its range (f and a overlap when udi_min_lux < 100).
+    """
+    cuts = np.array(sorted({100.0, float(udi_min_lux), UDI_TOP_EDGE}))
+    counts = np.bincount(np.searchsorted(cuts, hourly_spatial_average, side='right'),
+                         minlength=cuts.size + 1)
+    lower = np.concatenate(([-np.inf], cuts))
+    upper = np.concatenate((cuts, [np.inf]))
+
+    def between(lo, hi):  # hours with lo <= h < hi
+        return int(counts[(lower >= lo) & (upper <= hi)].sum())
+
+    udi_f = between(-np.inf, 100.0)
+    udi_s = between(100.0, udi_min_lux) if udi_min_lux > 100 else 0
+    udi_a = between(udi_min_lux, UDI_TOP_EDGE)
+    udi_e = between(UDI_TOP_EDGE, np.inf)
+    return udi_f, udi_s, udi_a, udi_e
+
+def analyze_room(npy_file, params):
+    """Computes all metrics for one room's .npy grid.
+
+    params is (min_lux, min_h_req, avg_lux, avg_h_req, udi_min_lux).
+    Returns (room_result, None), or (None, warning) when the file is skipped;
+    nothing is printed so it can run in a pool worker.
+    """
+    min_lux, min_h_req, avg_lux, avg_h_req, udi_min_lux = params
+    room_label = npy_file.stem
+    
+    try:
+        # Memory-mapped: pages are read as the reductions stream through them
+        arr = load_grid(npy_file)
+    except Exception as e:
+        return None, f"Warning: Could not read {npy_file}. Skipping. Error: {e}"
+        
+    # Get shape of the data array
+    total_points, total_hours = arr.shape
+    if total_points == 0 or total_hours == 0:
+        return None, f"Warning: Empty data array in {npy_file}. Skipping."
+
+    # Every per-point threshold count and the hourly mean in one pass:
+    # rows are [>= min_lux, >= avg_lux, >= 300 (sDA), > 1000 (ASE)]
+    counts, hourly_spatial_average = threshold_counts(
+        arr, (min_lux, avg_lux, 300.0, 1000.0), (False, False, False, True)
+    )
+    hours_above_min_lux, hours_above_avg_lux, hours_above_300_lux, hours_above_1000_lux = counts
+
+    # --- BREEAM MINIMUM POINT ANALYSIS ---
+    min_hours_in_room = int(hours_above_min_lux.min())
+    min_pass = min_hours_in_room >= min_h_req
+    points_passing_min = np.count_nonzero(hours_above_min_lux >= min_h_req)
+    min_area_pct = round((points_passing_min / total_points) * 100, 2)
+    
+    # --- BREEAM SPATIAL AVERAGE ANALYSIS ---
+    avg_hours_in_room = int(np.count_nonzero(hourly_spatial_average >= avg_lux))
+    avg_pass = avg_hours_in_room >= avg_h_req
+    points_passing_avg = np.count_nonzero(hours_above_avg_lux >= avg_h_req)
+    avg_area_pct = round((points_passing_avg / total_points) * 100, 2)
+
+    # --- sDA (Spatial Daylight Autonomy) ANALYSIS ---
+    # % of area receiving at least 300 lux for 50% of hours
+    sda_hour_threshold = total_hours * 0.5
+    points_passing_sda = np.count_nonzero(hours_above_300_lux >= sda_hour_threshold)
+    sDA_pct = round((points_passing_sda / total_points) * 100, 2)
+
+    # --- ASE (Annual Sun Exposure) ANALYSIS ---
+    # % of area receiving > 1000 lux for > 250 hours
+    # Note: ASE specifies "direct sunlight", but here we use total illuminance
+    # as is common practice in Honeybee ASE recipes.
+    points_passing_ase = np.count_nonzero(hours_above_1000_lux > 250)
+    ASE_pct = round((points_passing_ase / total_points) * 100, 2)
+
+    # --- UDI (Useful Daylight Illuminance) ANALYSIS ---
+    # Based on the spatial average illuminance for each hour
+    
+    # Calculate hours in each bin
+    udi_f_hours, udi_s_hours, udi_a_hours, udi_e_hours = udi_hours(hourly_spatial_average, udi_min_lux)
+
+    # Calculate percentage of occupied hours in each bin
+    udi_f_pct = round((udi_f_hours / total_hours) * 100, 2)
+    udi_s_pct = round((udi_s_hours / total_hours) * 100, 2)
+    udi_a_pct = round((udi_a_hours / total_hours) * 100, 2)
+    udi_e_pct = round((udi_e_hours / total_hours) * 100, 2)
+
+
+    return {
+        "room_label": room_label,
+        "n_points": total_points,
+        "total_hours": total_hours,
+        # BREEAM
+        "min_hours_achieved": min_hours_in_room,
+        "min_pass": min_pass,
+        "avg_hours_achieved": avg_hours_in_room,
+        "avg_pass": avg_pass,
+        "room_pass": min_pass and avg_pass,
+        "min_area_pct": min_area_pct,
+        "avg_area_pct": avg_area_pct,
+        # sDA and ASE
+        "sDA_300_50_pct": sDA_pct,
+        "ASE_1000_250_pct": ASE_pct,
+        # UDI Hours
+        "udi_f_hours (<100lx)": udi_f_hours,
+        "udi_s_hours (100-min)": udi_s_hours,
+        "udi_a_hours (min-3000lx)": udi_a_hours,
+        "udi_e_hours (>3000lx)": udi_e_hours,
+        # UDI Percentages
+        "udi_f_pct (<100lx)": udi_f_pct,
+        "udi_s_pct (100-min)": udi_s_pct,
+        "udi_a_pct (min-3000lx)": udi_a_pct,
+        "udi_e_pct (>3000lx)": udi_e_pct
+    }, None
+
+_POOL = None
+# One worker per logical CPU; Windows' ProcessPoolExecutor refuses more than 61
+POOL_WORKERS = min(os.cpu_count() or 1, 61)
+
+def _init_pool_worker():
+    # Rooms already run in parallel; keep each worker's kernel single-threaded
+    global _IN_POOL_WORKER
+    _IN_POOL_WORKER = True
+    if numba is not None:
+        numba.set_num_threads(1)
+
+def _get_pool():
+    """Process pool shared by all runs of this process (kept alive in --serve mode)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=POOL_WORKERS, initializer=_init_pool_worker)
+    return _POOL
+
+def _discard_pool():
+    """Drops a pool that lost a worker so the next run starts a fresh one."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+def run_analysis(args):
+    """Runs one analysis from the 6 positional CLI arguments (strings)."""
+    if len(args) != 6:
         sys.exit(
             "USAGE:\n  python post_process_daylight_all_grids.py "
             "<results_folder> <min_lux> <min_hours_req> <avg_lux> "
@@ -42,12 +454,12 @@ def main():
         )
 
     try:
-        results_root = Path(sys.argv[1]).expanduser().resolve()
-        min_lux = float(sys.argv[2])
-        min_h_req = int(sys.argv[3])
-        avg_lux = float(sys.argv[4])
-        avg_h_req = int(sys.argv[5])
-        udi_min_lux = float(sys.argv[6]) # New input
+        results_root = Path(args[0]).expanduser().resolve()
+        min_lux = float(args[1])
+        min_h_req = int(args[2])
+        avg_lux = float(args[3])
+        avg_h_req = int(args[4])
+        udi_min_lux = float(args[5]) # New input
     except (ValueError, IndexError):
         sys.exit("ERROR: Invalid arguments provided.")
 
@@ -56,97 +468,60 @@ def main():
     except FileNotFoundError as e:
         sys.exit(f"ERROR: {e}")
 
-    room_results = []
-    for npy_file in npy_files:
-        room_label = npy_file.stem
-        
+    params = (min_lux, min_h_req, avg_lux, avg_h_req, udi_min_lux)
+    # Plan from the headers alone: empty grids are skipped without loading
+    # them (files too short to hold a header without even opening them), the
+    # rest are queued largest first (an unreadable header sorts last and
+    # analyze_room reports the error).
+    outcomes = [None] * len(npy_files)
+    work = []
+    for i, npy_file in enumerate(npy_files):
         try:
-            arr = np.load(npy_file)
-        except Exception as e:
-            print(f"Warning: Could not read {npy_file}. Skipping. Error: {e}")
+            too_small = npy_file.stat().st_size < MIN_NPY_BYTES
+        except OSError:
+            too_small = False  # let analyze_room report why it cannot be read
+        if too_small:
+            outcomes[i] = (None, f"Warning: Empty or incomplete file {npy_file}. Skipping.")
             continue
-            
-        # Get shape of the data array
-        total_points, total_hours = arr.shape
-        if total_points == 0 or total_hours == 0:
-            print(f"Warning: Empty data array in {npy_file}. Skipping.")
-            continue
-
-        # --- BREEAM MINIMUM POINT ANALYSIS ---
-        hours_above_min_lux = (arr >= min_lux).sum(axis=1)
-        min_hours_in_room = int(hours_above_min_lux.min())
-        min_pass = min_hours_in_room >= min_h_req
-        points_passing_min = (hours_above_min_lux >= min_h_req).sum()
-        min_area_pct = round((points_passing_min / total_points) * 100, 2)
-        
-        # --- BREEAM SPATIAL AVERAGE ANALYSIS ---
-        hourly_spatial_average = arr.mean(axis=0)
-        avg_hours_in_room = int((hourly_spatial_average >= avg_lux).sum())
-        avg_pass = avg_hours_in_room >= avg_h_req
-        hours_above_avg_lux = (arr >= avg_lux).sum(axis=1)
-        points_passing_avg = (hours_above_avg_lux >= avg_h_req).sum()
-        avg_area_pct = round((points_passing_avg / total_points) * 100, 2)
-
-        # --- sDA (Spatial Daylight Autonomy) ANALYSIS ---
-        # % of area receiving at least 300 lux for 50% of hours
-        sda_hour_threshold = total_hours * 0.5
-        hours_above_300_lux = (arr >= 300).sum(axis=1)
-        points_passing_sda = (hours_above_300_lux >= sda_hour_threshold).sum()
-        sDA_pct = round((points_passing_sda / total_points) * 100, 2)
-
-        # --- ASE (Annual Sun Exposure) ANALYSIS ---
-        # % of area receiving > 1000 lux for > 250 hours
-        # Note: ASE specifies "direct sunlight", but here we use total illuminance
-        # as is common practice in Honeybee ASE recipes.
-        hours_above_1000_lux = (arr > 1000).sum(axis=1)
-        points_passing_ase = (hours_above_1000_lux > 250).sum()
-        ASE_pct = round((points_passing_ase / total_points) * 100, 2)
-
-        # --- UDI (Useful Daylight Illuminance) ANALYSIS ---
-        # Based on the spatial average illuminance for each hour
-        
-        # Calculate hours in each bin
-        udi_f_hours = int((hourly_spatial_average < 100).sum())
-        udi_e_hours = int((hourly_spatial_average > 3000).sum())
-        udi_a_hours = int(((hourly_spatial_average >= udi_min_lux) & (hourly_spatial_average <= 3000)).sum())
-
-        udi_s_hours = 0
-        if udi_min_lux > 100:
-            udi_s_hours = int(((hourly_spatial_average >= 100) & (hourly_spatial_average < udi_min_lux)).sum())
-            
-        # Calculate percentage of occupied hours in each bin
-        udi_f_pct = round((udi_f_hours / total_hours) * 100, 2)
-        udi_s_pct = round((udi_s_hours / total_hours) * 100, 2)
-        udi_a_pct = round((udi_a_hours / total_hours) * 100, 2)
-        udi_e_pct = round((udi_e_hours / total_hours) * 100, 2)
-
-
-        room_results.append({
-            "room_label": room_label,
-            "n_points": total_points,
-            "total_hours": total_hours,
-            # BREEAM
-            "min_hours_achieved": min_hours_in_room,
-            "min_pass": min_pass,
-            "avg_hours_achieved": avg_hours_in_room,
-            "avg_pass": avg_pass,
-            "room_pass": min_pass and avg_pass,
-            "min_area_pct": min_area_pct,
-            "avg_area_pct": avg_area_pct,
-            # sDA and ASE
-            "sDA_300_50_pct": sDA_pct,
-            "ASE_1000_250_pct": ASE_pct,
-            # UDI Hours
-            "udi_f_hours (<100lx)": udi_f_hours,
-            "udi_s_hours (100-min)": udi_s_hours,
-            "udi_a_hours (min-3000lx)": udi_a_hours,
-            "udi_e_hours (>3000lx)": udi_e_hours,
-            # UDI Percentages
-            "udi_f_pct (<100lx)": udi_f_pct,
-            "udi_s_pct (100-min)": udi_s_pct,
-            "udi_a_pct (min-3000lx)": udi_a_pct,
-            "udi_e_pct (>3000lx)": udi_e_pct
-        })
+        shape = npy_shape(npy_file)
+        if shape is not None and len(shape) == 2 and 0 in shape:
+            outcomes[i] = (None, f"Warning: Empty data array in {npy_file}. Skipping.")
+        else:
+            work.append((shape[0] * shape[1] if shape and len(shape) == 2 else 0, i))
+    work.sort(reverse=True)
+    order = [i for _, i in work]
+    if len(order) > 1:
+        # Rooms are independent: spread them over the cores, submitted one by
+        # one so the largest rooms start first on separate workers. Meanwhile a
+        # background thread warms the page cache with the files queued next:
+        # the rooms in progress plus one waiting room per worker.
+        stop = threading.Event()
+        ahead = threading.Semaphore(2 * POOL_WORKERS)
+        paths = [_fresh_uint16_copy(npy_files[i]) or npy_files[i] for i in order]
+        threading.Thread(target=_prefetch, args=(paths, stop, ahead), daemon=True).start()
+        try:
+            pool = _get_pool()
+            futures = {pool.submit(analyze_room, npy_files[i], params): i for i in order}
+            # Collect each room as soon as it finishes; the slots keep file order
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+                ahead.release()
+        except BrokenProcessPool:
+            _discard_pool()
+            sys.exit("ERROR: A worker process terminated abruptly (out of memory?). "
+                     "Run the analysis again.")
+        finally:
+            stop.set()
+            ahead.release()  # wake the prefetcher if it is waiting for a slot
+    else:
+        for i in order:
+            outcomes[i] = analyze_room(npy_files[i], params)
+    room_results = []
+    for result, warning in outcomes:
+        if warning:
+            print(warning)
+        else:
+            room_results.append(result)
     
     # --- Create the final JSON summary ---
     if room_results:
@@ -173,11 +548,51 @@ def main():
 
     json_path = results_root / "daylight_summary.json"
     try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2)
+        if orjson is not None:
+            json_path.write_bytes(orjson.dumps(
+                output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(output_data, f, indent=2)
         print(f"[OK] Analysed {len(room_results)} rooms from .npy files -> {json_path}")
     except IOError as e:
         sys.exit(f"ERROR: Could not write summary file to {json_path}. Details: {e}")
 
+JOB_KEYS = ("results_folder", "min_lux", "min_hours_req",
+            "avg_lux", "avg_hours_req", "udi_min_lux")
+
+def serve():
+    """Worker loop: one JSON job per stdin line, one JSON reply per stdout line.
+
+    Everything the analysis prints is captured and returned in "log", so
+    stdout only ever carries replies.
+    """
+    out = sys.stdout
+    for line in iter(sys.stdin.readline, ""):
+        line = line.strip()
+        if not line:
+            continue
+        log = io.StringIO()
+        ok = True
+        try:
+            job = json.loads(line)
+            with redirect_stdout(log):
+                run_analysis([str(job[k]) for k in JOB_KEYS])
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                ok = False
+                print(e.code, file=log)
+        except Exception as e:
+            ok = False
+            print(f"ERROR: {type(e).__name__}: {e}", file=log)
+        out.write(json.dumps({"ok": ok, "log": log.getvalue()}) + "\n")
+        out.flush()
+
+def main():
+    if sys.argv[1:] == ["--serve"]:
+        serve()
+    else:
+        run_analysis(sys.argv[1:])
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
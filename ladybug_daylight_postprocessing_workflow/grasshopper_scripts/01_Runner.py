@@ -1,6 +1,7 @@
 # GhPython (IronPython 2.7) - Component 1: ANALYSIS RUNNER
 
-import os, sys, subprocess
+import os, sys, subprocess, json
+import scriptcontext as sc
 
 # ==============================================================================
 # --- GRASSHOPPER COMPONENT DOCUMENTATION ---
@@ -39,6 +40,56 @@ except: pass # Fails gracefully if outputs are not yet defined
 # --- CONFIGURATION (EDIT THESE PATHS) ---
 PYTHON_EXECUTABLE_PATH = r"C:\Python_Scripts\lbt-venv\Scripts\python.exe"
 EXTERNAL_SCRIPT_PATH = r"C:\Python_Scripts\post_process_daylight_all_grids.py"
+# Keep one external Python process alive between runs (skips interpreter and
+# NumPy start-up on every parameter change). Set False to start a fresh
+# process for each run instead.
+USE_PERSISTENT_WORKER = True
+
+# Start the external Python without a console window (CREATE_NO_WINDOW, Windows only)
+NO_WINDOW = 0x08000000 if os.name == "nt" else 0
+
+# --- PERSISTENT WORKER ---
+def stop_worker():
+    entry = sc.sticky.pop("DaylightWorker", None)
+    if entry:
+        try:
+            entry[0].stdin.close()  # worker exits at end of input
+            entry[0].wait()
+        except Exception:
+            try: entry[0].kill()
+            except Exception: pass
+
+def get_worker():
+    # Restart when the interpreter or the script (path or contents) changed
+    key = (PYTHON_EXECUTABLE_PATH, EXTERNAL_SCRIPT_PATH, os.path.getmtime(EXTERNAL_SCRIPT_PATH))
+    entry = sc.sticky.get("DaylightWorker")
+    if entry and entry[1] == key and entry[0].poll() is None:
+        return entry[0]
+    stop_worker()
+    proc = subprocess.Popen([PYTHON_EXECUTABLE_PATH, EXTERNAL_SCRIPT_PATH, "--serve"],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            creationflags=NO_WINDOW)
+    sc.sticky["DaylightWorker"] = (proc, key)
+    return proc
+
+def run_in_worker(job):
+    """Send one job; returns (ok, log). Non-reply lines (e.g. stderr) go to the log."""
+    proc = get_worker()
+    proc.stdin.write(json.dumps(job) + "\n")
+    proc.stdin.flush()
+    extra = []
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            stop_worker()
+            return False, "".join(extra) + "External worker exited unexpectedly."
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            reply = None
+        if isinstance(reply, dict) and "ok" in reply:
+            return reply["ok"], "".join(extra) + reply.get("log", "")
+        extra.append(line)
 
 # --- INITIALIZE OUTPUTS ---
 message = "Set 'run_analysis' to True."
@@ -57,16 +108,27 @@ if run_analysis:
     else:
         try:
             message = "[INFO] Running external analysis script... Please wait."
-            command_args = [
-                PYTHON_EXECUTABLE_PATH, EXTERNAL_SCRIPT_PATH,
-                results_folder, str(min_lux), str(min_hours_req),
-                str(avg_lux), str(avg_hours_req), str(udi_min_lux)
-            ]
-            proc = subprocess.Popen(command_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-            stdout, stderr = proc.communicate()
-            log = stdout + stderr
+            if USE_PERSISTENT_WORKER:
+                job = {
+                    "results_folder": results_folder, "min_lux": min_lux,
+                    "min_hours_req": min_hours_req, "avg_lux": avg_lux,
+                    "avg_hours_req": avg_hours_req, "udi_min_lux": udi_min_lux
+                }
+                ok, log = run_in_worker(job)
+            else:
+                command_args = [
+                    PYTHON_EXECUTABLE_PATH, EXTERNAL_SCRIPT_PATH,
+                    results_folder, str(min_lux), str(min_hours_req),
+                    str(avg_lux), str(avg_hours_req), str(udi_min_lux)
+                ]
+                # Argument list, no cmd.exe in between; communicate() drains both pipes
+                proc = subprocess.Popen(command_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        creationflags=NO_WINDOW)
+                stdout, stderr = proc.communicate()
+                log = stdout + stderr
+                ok = proc.returncode == 0
 
-            if proc.returncode != 0:
+            if not ok:
                 message = "[ERROR] External script failed. Check 'log' for details."
             else:
                 summary_file = os.path.join(results_folder, "daylight_summary.json")